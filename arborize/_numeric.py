@@ -0,0 +1,49 @@
+import functools
+import math
+
+import numpy as np
+import numpy.typing as npt
+
+
+def _cumulative_lengths(coords: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    arcs = np.empty(len(coords))
+    arcs[0] = 0
+    diff = coords[1:] - coords[:-1]
+    # Row-wise dot product, avoids the `diff**2` temporary.
+    seglens = np.einsum("ij,ij->i", diff, diff)
+    np.sqrt(seglens, out=seglens)
+    np.cumsum(seglens, out=arcs[1:])
+    return arcs
+
+
+def _cumulative_lengths_loop(coords):
+    n = coords.shape[0]
+    arcs = np.empty(n)
+    arcs[0] = 0.0
+    s = 0.0
+    for i in range(1, n):
+        dx = coords[i, 0] - coords[i - 1, 0]
+        dy = coords[i, 1] - coords[i - 1, 1]
+        dz = coords[i, 2] - coords[i - 1, 2]
+        s += math.sqrt(dx * dx + dy * dy + dz * dz)
+        arcs[i] = s
+    return arcs
+
+
+@functools.cache
+def _get_cumulative_lengths_kernel():
+    # On short branches the NumPy dispatch overhead outweighs the actual work, so
+    # when Numba is available we compile the plain loop instead. Numba is imported
+    # on first use, to keep it out of `import arborize`.
+    try:
+        from numba import njit
+    except ImportError:
+        return _cumulative_lengths
+    return njit(cache=True, fastmath=True)(_cumulative_lengths_loop)
+
+
+def cumulative_lengths(coords: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Return the cumulative cable length at each point of ``coords``.
+    """
+    return _get_cumulative_lengths_kernel()(coords)
@@ -1,10 +1,13 @@
 import dataclasses
+import functools
 import typing
 from typing import TYPE_CHECKING, Iterable
 
 import numpy as np
 import numpy.typing as npt
 
+from ._numeric import cumulative_lengths
+
 if TYPE_CHECKING:
     from schematic import Point
 
@@ -20,52 +23,60 @@ def get_location_name(pts: Iterable["Point"]) -> str:
     return locstr
 
 
-def get_arclengths(pts: Iterable["Point"]) -> npt.NDArray[np.float_]:
-    coords = np.array([pt.coords for pt in pts])
-    rel_dist = np.diff(coords, axis=0, prepend=[coords[0, :]])
-    arcsums = np.cumsum(np.sum(rel_dist**2, axis=1) ** 0.5)
-    if np.isclose(0, arcsums[-1]):
-        return np.ones(arcsums.shape)
-    return arcsums / arcsums[-1]
+def get_arclengths(coords: npt.ArrayLike) -> npt.NDArray[np.float64]:
+    coords = np.asarray(coords)
+    if coords.dtype != np.float32:
+        coords = coords.astype(np.float64, copy=False)
+    if len(coords) < 2:
+        return np.ones(len(coords))
+    arcs = cumulative_lengths(coords)
+    if np.isclose(0, arcs[-1]):
+        return np.ones(arcs.shape)
+    arcs /= arcs[-1]
+    return arcs
 
 
 MechIdTuple = typing.Union[tuple[str], tuple[str, str], tuple[str, str, str]]
 MechId = typing.Union[str, MechIdTuple]
 
 
+@functools.cache
+def field_names(cls) -> tuple[str, ...]:
+    return tuple(field.name for field in dataclasses.fields(cls))
+
+
 @dataclasses.dataclass
 class Copy:
     def copy(self):
-        other = type(self)()
-        for field in dataclasses.fields(self):
-            setattr(other, field.name, getattr(self, field.name))
+        # Skip `__init__`, the field values are already converted.
+        other = type(self).__new__(type(self))
+        other.__dict__.update(self.__dict__)
         return other
 
 
 @dataclasses.dataclass
 class Iterable:
     def __iter__(self):
-        yield from {
-            field.name: getattr(self, field.name) for field in dataclasses.fields(self)
-        }.items()
+        for name in field_names(type(self)):
+            yield name, getattr(self, name)
 
 
 @dataclasses.dataclass
 class Merge:
     def merge(self, other):
-        for field in dataclasses.fields(self):
-            value = getattr(other, field.name)
+        for name in field_names(type(self)):
+            value = getattr(other, name)
             if value is not None and not is_empty_constraint(value):
-                setattr(self, field.name, value)
+                setattr(self, name, value)
 
 
 @dataclasses.dataclass
 class Assert:
     def assert_(self):
-        for field in dataclasses.fields(self):
-            value = getattr(self, field.name, None)
+        for name in field_names(type(self)):
+            value = getattr(self, name, None)
             if value is None or is_empty_constraint(value):
-                raise ValueError(f"Missing '{field.name}' value.", field.name)
+                raise ValueError(f"Missing '{name}' value.", name)
 
 
 def is_empty_constraint(value):
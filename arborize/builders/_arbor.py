@@ -1,14 +1,38 @@
-import dataclasses
 import typing
 from collections import defaultdict
-from itertools import tee
 from math import isnan
 
-if typing.TYPE_CHECKING:
-    import arbor
+# Arbor is only imported on first use, so that importing arborize doesn't load it.
+arbor = None
+# todo: drop when units are released
+_HAS_UNITS = False
+_CM_UNIT = _RL_UNIT = 1
+_ION_UNITS = defaultdict(lambda: 1)
+
+
+def _import_arbor():
+    global arbor, _HAS_UNITS, _CM_UNIT, _RL_UNIT, _ION_UNITS
+    if arbor is not None:
+        return
+    try:
+        import arbor as _arbor
+    except ImportError:
+        raise ImportError(
+            "The arbor builder requires `arbor` to be installed."
+        ) from None
+    # todo: drop when units are released
+    if hasattr(_arbor, "units"):
+        units = _arbor.units
+        _HAS_UNITS = True
+        _CM_UNIT = units.F / units.m2
+        _RL_UNIT = units.Ohm * units.cm
+        _ION_UNITS = {"rev_pot": units.mV, "int_con": units.mM, "ext_con": units.mM}
+    arbor = _arbor
 
+
+if typing.TYPE_CHECKING:
     from .. import CableType
-    from ..schematic import CableBranch, Point, Schematic
+    from ..schematic import CableBranch, Schematic
 
 
 class CableCellTemplate:
@@ -23,45 +47,38 @@ class CableCellTemplate:
         self.decor = decor
 
     def build(self):
-        import arbor
-
+        _import_arbor()
         return arbor.cable_cell(self.morphology, self.decor, self.labels)
 
 
-def hash_labelset(labels: list[str]):
-    return "&".join(l.replace("&", "&&") for l in sorted(labels))
-
-
 def get_label_dict(schematic: "Schematic"):
-    import arbor
-
-    labelsets: dict[str, int] = {}
+    labelsets: dict[frozenset[str], int] = {}
     label_dict = defaultdict(list)
     for b in schematic.cables:
-        for p in b.points:
-            h = hash_labelset(p.branch.labels)
-            if h not in labelsets:
+        # All points of a unit branch share its labels, so visit each unit once.
+        for unit in dict.fromkeys(p.branch for p in b.points):
+            labelset = frozenset(unit.labels)
+            if labelset not in labelsets:
                 lset_id = len(labelsets)
-                for l in p.branch.labels:
+                for l in unit.labels:
                     label_dict[l].append(lset_id)
-                labelsets[h] = lset_id
-    return labelsets, arbor.label_dict(
-        {
-            label: (
-                "(join " + " ".join(f"(tag {tag})" for tag in tags) + ")"
-                if len(tags) > 1
-                else f"(tag {tags[0]})"
-            )
-            for label, tags in label_dict.items()
-        }
-    )
+                labelsets[labelset] = lset_id
+    _import_arbor()
+    arbor_labels = arbor.label_dict()
+    tag_expr = "(tag {})".format
+    for label, tags in label_dict.items():
+        if len(tags) == 1:
+            arbor_labels[label] = tag_expr(tags[0])
+        else:
+            arbor_labels[label] = "(join " + " ".join(map(tag_expr, tags)) + ")"
+    return labelsets, arbor_labels
 
 
 def _to_units(value, unit: "arbor.units.unit") -> "arbor.units.quantity":
-    import arbor
-
     # todo: drop when units are released
-    if hasattr(arbor, "units") and isinstance(value, arbor.units.quantity):
+    if _HAS_UNITS and isinstance(value, arbor.units.quantity):
+        if value.units == unit:
+            return value
         ret = value.value_as(unit)
         if isnan(ret):
             raise ValueError(f"Can't convert {value.units} to {unit}.")
@@ -71,105 +88,80 @@ def _to_units(value, unit: "arbor.units.unit") -> "arbor.units.quantity":
 
 
 def paint_cable_type_cable(decor: "arbor.decor", label: str, cable_type: "CableType"):
-    import arbor
-
+    _import_arbor()
     decor.paint(
         f'"{label}"',
-        cm=_to_units(
-            cable_type.cable.cm,
-            (arbor.units.F / arbor.units.m2) if hasattr(arbor, "units") else 1,
-        ),
-        rL=_to_units(
-            cable_type.cable.Ra,
-            (arbor.units.Ohm * arbor.units.cm) if hasattr(arbor, "units") else 1,
-        ),
+        cm=_to_units(cable_type.cable.cm, _CM_UNIT),
+        rL=_to_units(cable_type.cable.Ra, _RL_UNIT),
     )
 
 
 def paint_cable_type_ions(decor: "arbor.decor", label: str, cable_type: "CableType"):
-    import arbor
-
-    units = (
-        {
-            "rev_pot": arbor.units.mV,
-            "int_con": arbor.units.mM,
-            "ext_con": arbor.units.mM,
-        }
-        if hasattr(arbor, "units")
-        # todo: drop when units are released
-        else defaultdict(lambda: 1)
-    )
+    _import_arbor()
+    paint = decor.paint
+    region = f'"{label}"'
     for ion_name, ion in cable_type.ions.items():
+        props = {k: _to_units(v, _ION_UNITS[k]) for k, v in ion}
         try:
-            decor.paint(
-                f'"{label}"',
-                ion=ion_name,
-                **{
-                    k: _to_units(v, units[k])
-                    for k, v in dataclasses.asdict(ion).items()
-                },
-            )
+            paint(region, ion=ion_name, **props)
         except TypeError:
             # todo: drop when units are released
             # Support older `ion_name` kwarg
-            decor.paint(
-                f'"{label}"',
-                ion_name=ion_name,
-                **{
-                    k: _to_units(v, units[k])
-                    for k, v in dataclasses.asdict(ion).items()
-                },
-            )
+            paint(region, ion_name=ion_name, **props)
 
 
 def paint_cable_type_mechanisms(
     decor: "arbor.decor", label: str, cable_type: "CableType"
 ):
-    import arbor
-
+    _import_arbor()
+    paint = decor.paint
+    density = arbor.density
+    region = f'"{label}"'
     for mech_id, mech in cable_type.mechs.items():
-        decor.paint(f'"{label}"', arbor.density(mech_id, mech.parameters))
+        paint(region, density(mech_id, mech.parameters))
 
 
 def paint_cable_type(decor: "arbor.decor", label: str, cable_type: "CableType"):
+    # Arbor's `decor.paint` can't combine cable properties, ions and mechanisms in
+    # one call, so each group is painted by its own loop.
     paint_cable_type_cable(decor, label, cable_type)
     paint_cable_type_ions(decor, label, cable_type)
     paint_cable_type_mechanisms(decor, label, cable_type)
 
 
 def get_decor(schematic: "Schematic"):
-    import arbor
-
+    _import_arbor()
     decor = arbor.decor()
-    for label, cable_type in schematic.definition.get_cable_types().items():
+    for label, cable_type in schematic.get_cable_types().items():
         paint_cable_type(decor, label, cable_type)
 
     return decor
 
 
 def arbor_build(schematic: "Schematic"):
-    import arbor
-
+    _import_arbor()
     schematic.freeze()
     if not hasattr(schematic, "arbor"):
         tree = arbor.segment_tree()
+        # The segment tree has no bulk append, so at least avoid regrowing it.
+        tree.reserve(sum(max(len(b.points) - 1, 0) for b in schematic.cables))
+        append = tree.append
         # Stores the ids of the segments to append to.
         branch_endpoints: dict["CableBranch", int] = {}
         labelsets, label_dict = get_label_dict(schematic)
+        # Tag each unit branch with a unique tag per label combination
+        unit_tags = {unit: labelsets[frozenset(unit.labels)] for unit in schematic}
         for bid, branch in enumerate(schematic.cables):
             if len(branch.points) < 2:
                 # Empty branches mess up the branch id numbering, so we forbid them
                 raise RuntimeError(f"Branch {bid} needs at least 2 points.")
-            pts = iter(branch.points)
-            # Set up pairwise iterators
-            pts_a, pts_b = tee(pts)
-            next(pts_b)
+            mpts = _mkpts(branch)
+            # Each segment is tagged by the unit branch of its distal point
+            tags = [unit_tags[p.branch] for p in branch.points]
             # Start branch from the endpoint, if the branch has a parent.
             ptid = branch_endpoints[branch.parent] if branch.parent else arbor.mnpos
-            for i, (p1, p2) in enumerate(zip(pts_a, pts_b)):
-                # Tag it with a unique tag per label combination
-                tag = hash_labelset(p2.branch.labels)
-                ptid = tree.append(ptid, _mkpt(p1), _mkpt(p2), tag=labelsets.get(tag))
+            for m1, m2, tag in zip(mpts, mpts[1:], tags[1:]):
+                ptid = append(ptid, m1, m2, tag=tag)
             branch_endpoints[branch] = ptid
 
         schematic.arbor = CableCellTemplate(
@@ -180,7 +172,9 @@ def arbor_build(schematic: "Schematic"):
     return schematic.arbor.build()
 
 
-def _mkpt(p: "Point") -> "arbor.mpoint":
-    import arbor
-
-    return arbor.mpoint(*p.coords, p.radius)
+def _mkpts(branch: "CableBranch") -> list["arbor.mpoint"]:
+    mpoint = arbor.mpoint
+    return [
+        mpoint(x, y, z, r)
+        for (x, y, z), r in zip(branch.coords.tolist(), branch.radii.tolist())
+    ]
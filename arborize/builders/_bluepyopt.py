@@ -4,11 +4,20 @@ import typing
 from collections import defaultdict
 
 from ..constraints import Constraint, ConstraintsDefinition
-from ._neuron import neuron_build
+from ._neuron import _ion_attr_names, neuron_build
 
 if typing.TYPE_CHECKING:
     from ..schematic import Schematic
 
+_LABEL_SPLIT = re.compile("(?<!_)_(?!_)")
+
+
+def _split_label(label: str) -> list[str]:
+    # Compound labels join labels with `_`, and escape `_` in labels as `__`.
+    if "__" not in label:
+        return label.split("_")
+    return [l.replace("__", "_") for l in _LABEL_SPLIT.split(label)]
+
 
 def bluepyopt_build(schematic: "Schematic"):
     import bluepyopt.ephys as ephys
@@ -24,45 +33,47 @@ def bluepyopt_build(schematic: "Schematic"):
         multiprocessing.reduction.dump = dill.dump
 
     class ArborizeMorphology(ephys.morphologies.Morphology):
-        def __init__(self, schematic: "Schematic"):
+        def __init__(self, schematic: "Schematic", cable_types):
             super().__init__()
             self._schematic = schematic
+            # The compound labels of a frozen schematic don't change, so split them
+            # once instead of on every instantiation.
+            self._labels = {label: _split_label(label) for label in cable_types.keys()}
 
         def instantiate(self, sim=None, icell=None):
             self.arborized_cell = neuron_build(self._schematic)
-            for label in self._schematic.get_compound_cable_types().keys():
+            for label, labels in self._labels.items():
                 section_list = getattr(icell, label)
-                labels = [l.replace("__", "_") for l in re.split("(?<!_)_(?!_)", label)]
                 for sec in self.arborized_cell.get_sections_with_all_labels(labels):
                     section_list.append(sec.__neuron__())
 
         def destroy(self, sim=None):
             del self.arborized_cell
 
-    morph = ArborizeMorphology(schematic)
     schematic.freeze()
     constraints = schematic.definition
     if not isinstance(constraints, ConstraintsDefinition):
         raise TypeError(
             f"Optimization schematic must contain constraints, got {type(constraints)} instead."
         )
-    cable_types = schematic.get_compound_cable_types()
+    cable_types, mech_labels = _get_bpyopt_structure(schematic)
+    # Resolve the mechanism names on every build, like `glia.insert` does when the
+    # cell is instantiated, so that they follow glia's current preferences.
+    mech_names = {mech_id: glia.resolve(mech_id) for mech_id in mech_labels}
+    morph = ArborizeMorphology(schematic, cable_types)
 
     bpyopt_seclists = {
         label: ephys.locations.NrnSeclistLocation(label, seclist_name=label)
         for label in cable_types.keys()
     }
 
-    mech_locations = defaultdict(list)
-    for label, cable_type in cable_types.items():
-        for mech in cable_type.mechs:
-            mech_locations[mech].append(bpyopt_seclists[label])
-
     bpyopt_mechs = [
         ephys.mechanisms.NrnMODMechanism(
-            name=glia.resolve(mech), prefix=glia.resolve(mech), locations=locations
+            name=mech_names[mech],
+            prefix=mech_names[mech],
+            locations=[bpyopt_seclists[label] for label in labels],
         )
-        for mech, locations in mech_locations.items()
+        for mech, labels in mech_labels.items()
     ]
 
     bpyopt_cable_params = [
@@ -76,11 +87,10 @@ def bluepyopt_build(schematic: "Schematic"):
         for prop, constraint in cable_type.cable
     ]
 
-    ion_prop_map = {"rev_pot": "e{ion}", "int_con": "{ion}i", "ext_con": "{ion}o"}
     bpyopt_ion_params = [
         ephys.parameters.NrnSectionParameter(
             name=f"{label}_{ion}_{prop}",
-            param_name=ion_prop_map[prop].format(ion=ion_name),
+            param_name=_ion_attr_names(ion_name)[prop],
             locations=[bpyopt_seclists[label]],
             **_to_bpyopt_kwargs(constraint),
         )
@@ -91,8 +101,8 @@ def bluepyopt_build(schematic: "Schematic"):
 
     bpyopt_mech_params = [
         ephys.parameters.NrnSectionParameter(
-            name=f"{param}_{glia.resolve(mech_id)}_{label}",
-            param_name=f"{param}_{glia.resolve(mech_id)}",
+            name=f"{param}_{mech_names[mech_id]}_{label}",
+            param_name=f"{param}_{mech_names[mech_id]}",
             locations=[bpyopt_seclists[label]],
             **_to_bpyopt_kwargs(constraint),
         )
@@ -120,6 +130,20 @@ def bluepyopt_build(schematic: "Schematic"):
     )
 
 
+def _get_bpyopt_structure(schematic: "Schematic"):
+    # The compound cable types of a frozen schematic don't change, so they and the
+    # labels of each mechanism are cached on the schematic. The BluePyOpt objects
+    # themselves carry parameter values, and are created anew on every build.
+    if not hasattr(schematic, "_bpyopt_cache"):
+        cable_types = schematic.get_compound_cable_types()
+        mech_labels = defaultdict(list)
+        for label, cable_type in cable_types.items():
+            for mech_id in cable_type.mechs:
+                mech_labels[mech_id].append(label)
+        schematic._bpyopt_cache = cable_types, dict(mech_labels)
+    return schematic._bpyopt_cache
+
+
 def _to_bpyopt_kwargs(constraint: "Constraint"):
     frozen = constraint.upper == constraint.lower
     return dict(
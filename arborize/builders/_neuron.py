@@ -1,11 +1,12 @@
-import dataclasses
+import functools
 import random
 import typing
+from collections import defaultdict
 from typing import TYPE_CHECKING, Mapping, Sequence
 
 import errr
 
-from .._util import get_arclengths, get_location_name
+from .._util import MechIdTuple, field_names, get_arclengths, get_location_name
 from ..constraints import Constraint
 from ..definitions import CableProperties, Ion, Mechanism, MechId, mechdict
 from ..exceptions import TransmitterError, UnknownLocationError, UnknownSynapseError
@@ -16,12 +17,33 @@ if TYPE_CHECKING:
 
     from ..schematic import Location, Schematic
 
+# NEURON is only imported on first use, so that importing arborize doesn't start it.
+glia = p = None
+
+
+def _import_neuron():
+    global glia, p
+    if p is None:
+        import glia as _glia
+        from patch import p as _p
+
+        glia, p = _glia, _p
+
 
 class NeuronModel:
     def __init__(self, sections, locations, cable_types):
         self._sections: Sequence["Section"] = sections
         self._locations: dict["Location", "LocationAccessor"] = locations
+        self._location_keys: tuple["Location", ...] = tuple(locations.keys())
         self._cable_types = cable_types
+        # Index the section positions by label, and by label combination, so that the
+        # label queries don't have to scan every section.
+        self._label_index: dict[str, list[int]] = defaultdict(list)
+        self._labelset_index: dict[frozenset[str], list[int]] = defaultdict(list)
+        for i, section in enumerate(sections):
+            for label in section.labels:
+                self._label_index[label].append(i)
+            self._labelset_index[frozenset(section.labels)].append(i)
 
     @property
     def sections(self) -> Sequence["Section"]:
@@ -43,14 +65,30 @@ class NeuronModel:
         la = self.get_location(loc)
         return la.section(la.arc(sx))
 
+    def _get_sections(self, idx: typing.Iterable[int]) -> list["Section"]:
+        sections = self._sections
+        return [sections[i] for i in idx]
+
     def get_sections_with_label(self, label: str):
-        return [s for s in self.sections if label in s.labels]
+        return self._get_sections(self._label_index.get(label, ()))
 
     def get_sections_with_any_label(self, labels: list[str]):
-        return [s for s in self.sections if any(lbl in labels for lbl in s.labels)]
+        index = self._label_index
+        return self._get_sections(
+            sorted(set().union(*(index[lbl] for lbl in labels if lbl in index)))
+        )
 
     def get_sections_with_all_labels(self, labels: list[str]):
-        return [s for s in self.sections if all(lbl in labels for lbl in s.labels)]
+        # There are only a handful of label combinations, so check those instead.
+        labels = set(labels)
+        return self._get_sections(
+            sorted(
+                i
+                for labelset, idx in self._labelset_index.items()
+                if labelset <= labels
+                for i in idx
+            )
+        )
 
     def insert_synapse(
         self,
@@ -59,8 +97,7 @@ class NeuronModel:
         attributes=None,
         sx=0.5,
     ) -> "PointProcess":
-        import glia
-
+        _import_neuron()
         la = self.get_location(loc)
         synapses = la.section.synapse_types
         if not synapses:
@@ -97,8 +134,7 @@ class NeuronModel:
         source=None,
         **kwargs,
     ):
-        from patch import p
-
+        _import_neuron()
         synapse = self.insert_synapse(label, loc, attributes, sx)
         synapse.gid = gid
         if source is None:
@@ -110,11 +146,10 @@ class NeuronModel:
     def insert_transmitter(
         self, gid: int, loc: "Location", sx=0.5, source=None, **kwargs
     ):
-        from patch import p
-
+        _import_neuron()
         la = self.get_location(loc)
         if source is None:
-            if hasattr(la.section, "_transmitter"):
+            if la.section._transmitter is not None:
                 if gid != la.section._transmitter.gid:
                     raise TransmitterError(
                         f"A transmitter already exists with gid {la.section._transmitter.gid}"
@@ -124,7 +159,7 @@ class NeuronModel:
                 tm = p.ParallelCon(self.get_segment(loc, sx), gid, **kwargs)
                 la.section._transmitter = tm
         else:
-            if hasattr(la.section, "_source"):
+            if la.section._source is not None:
                 if gid != la.section._source_gid:
                     raise TransmitterError(
                         f"A source variable already exists with gid {la.section._source_gid}"
@@ -138,10 +173,10 @@ class NeuronModel:
         return tm
 
     def get_random_location(self):
-        return random.choice([*self._locations.keys()])
+        return random.choice(self._location_keys)
 
     def record(self):
-        soma = [s for s in self._sections if "soma" in s.labels]
+        soma = self.get_sections_with_label("soma")
         if not soma:
             raise RuntimeError("No soma to record from")
         else:
@@ -149,92 +184,145 @@ class NeuronModel:
 
     def __getattr__(self, item):
         if item in self._cable_types:
-            return [s for s in self._sections if item in s.labels]
+            return self.get_sections_with_label(item)
         else:
             return super().__getattribute__(item)
 
 
 def neuron_build(schematic: "Schematic"):
+    """
+    Build a NEURON model of the schematic. The schematic is frozen first, and the
+    definitions of its branches must not be changed after that.
+    """
+    _import_neuron()
     schematic.freeze()
     name = schematic.create_name()
-    branchmap = {}
-    sections = []
+    branches = schematic.branches
+    values = _get_concrete_values(schematic)
+    sections: list["Section"] = [None] * len(branches)
     locations = {}
-    for branch in schematic:
+    parents = schematic.parent_positions
+    for i, branch in enumerate(branches):
         bname = f"{name}_{get_location_name(branch.points)}"
-        alens = get_arclengths(branch.points)
-        section, mechs = _build_branch(branch, bname)
+        alens = get_arclengths(branch.coords).tolist()
+        section, mechs = _build_branch(branch, bname, values[branch.definition])
         section.locations = [point.loc for point in branch.points]
-        for i, point in enumerate(branch.points):
-            try:
-                arcpair = (alens[i], alens[i + 1])
-            except IndexError:
-                arcpair = (1, 1)
+        # Each point spans the arc up to the next point, the last point sits at the end.
+        arcpairs = zip(alens, alens[1:] + [1])
+        for point, arcpair in zip(branch.points, arcpairs):
             locations[point.loc] = LocationAccessor(point.loc, section, mechs, arcpair)
-        sections.append(section)
-        branchmap[branch] = section
-        if branch.parent:
-            section.connect(branchmap[branch.parent])
+        # Parents precede their children in the branch order.
+        if parents[i] >= 0:
+            section.connect(sections[parents[i]])
+        sections[i] = section
     return NeuronModel(sections, locations, [*schematic.get_cable_types().keys()])
 
 
-def _build_branch(branch, name):
-    from patch import p
-
+def _build_branch(branch, name, values):
     section = p.Section(name=name)
     section.labels = [*branch.labels]
     section.synapses = []
-    apply_geometry(section, branch.points)
-    apply_cable_properties(section, branch.definition.cable)
-    mechs = apply_mech_definitions(section, branch.definition.mechs)
-    apply_ions(section, branch.definition.ions)
+    section._transmitter = None
+    section._source = None
+    apply_geometry(section, branch.coords, branch.radii)
+    cable, ions, mech_params = values
+    _set_attributes(section, cable)
+    mechs = _insert_mechs(section, mech_params)
+    _set_attributes(section, ions)
     section.synapse_types = branch.definition.synapses
     return section, mechs
 
 
-def apply_geometry(section, points):
-    coords = []
-    diams = []
-    for point in points:
-        coords.append(point.coords)
-        diams.append(point.radius * 2)
-    section.add_3d(coords, diams)
+def _get_concrete_values(schematic: "Schematic"):
+    # The definitions of a frozen schematic don't change, and are shared by all unit
+    # branches with the same labels. So the concrete values are collected once per
+    # definition, and cached on the schematic for every build of it.
+    if not hasattr(schematic, "_neuron_cache"):
+        schematic._neuron_cache = {
+            definition: (
+                _concrete_cable_values(definition.cable),
+                _concrete_ion_values(definition.ions),
+                _concrete_mech_values(definition.mechs),
+            )
+            for definition in dict.fromkeys(
+                branch.definition for branch in schematic.branches
+            )
+        }
+    return schematic._neuron_cache
+
+
+def apply_geometry(section, coords, radii):
+    # `add_3d` passes the points one by one to NEURON, plain floats convert fastest.
+    section.add_3d(coords.tolist(), (radii * 2).tolist())
     section.nseg = int((section.L // 10) + 1)
 
 
-def apply_cable_properties(section, cable_props: "CableProperties"):
-    for field in dataclasses.fields(cable_props):
-        prop = getattr(cable_props, field.name)
-        if not isinstance(prop, Constraint):
-            setattr(section, field.name, prop)
+def _set_attributes(section, values: dict[str, float]):
+    # Set the values on the NEURON section directly, instead of through the
+    # forwarding `__setattr__` of the patch wrapper.
+    nrn_section = section.__neuron__()
+    for name, value in values.items():
+        try:
+            setattr(nrn_section, name, value)
+        except (LookupError, AttributeError):
+            # Let patch handle attributes NEURON doesn't know.
+            setattr(section, name, value)
 
 
-def apply_ions(section, ions: typing.Dict[str, "Ion"]):
-    prop_map = {"rev_pot": "e{ion}", "int_con": "{ion}i", "ext_con": "{ion}o"}
-    for ion_name, ion_props in ions.items():
-        for prop, value in ion_props:
-            if not isinstance(value, Constraint):
-                setattr(
-                    section,
-                    prop_map[prop].format(ion=ion_name),
-                    value,
-                )
+def _insert_mechs(section, mech_params: dict["MechIdTuple", dict[str, float]]):
+    _import_neuron()
+    # Let glia set the parameters on insertion.
+    return {
+        mech_id: glia.insert(section, *mech_id, attributes=params)
+        for mech_id, params in mech_params.items()
+    }
+
+
+@functools.cache
+def _ion_attr_names(ion_name: str) -> dict[str, str]:
+    # Names of the NEURON section attributes of an ion's properties.
+    return {
+        "rev_pot": f"e{ion_name}",
+        "int_con": f"{ion_name}i",
+        "ext_con": f"{ion_name}o",
+    }
 
 
-def apply_mech_definitions(section, mech_defs: dict["MechId", "Mechanism"]):
-    import glia
+# The `_concrete_*_values` functions leave out the constraints, which are set by the
+# optimizer instead.
+
+
+def _concrete_cable_values(cable_props: "CableProperties") -> dict[str, float]:
+    values = {}
+    for name in field_names(type(cable_props)):
+        value = getattr(cable_props, name)
+        if not isinstance(value, Constraint):
+            values[name] = value
+    return values
+
+
+def _concrete_ion_values(ions: typing.Dict[str, "Ion"]) -> dict[str, float]:
+    values = {}
+    for ion_name, ion_props in ions.items():
+        attr_names = _ion_attr_names(ion_name)
+        for prop in field_names(type(ion_props)):
+            value = getattr(ion_props, prop)
+            if not isinstance(value, Constraint):
+                values[attr_names[prop]] = value
+    return values
 
-    mechs = {}
-    for mech_id, mech_def in mech_defs.items():
-        if isinstance(mech_id, str):
-            mech_id = (mech_id,)
-        mech = glia.insert(section, *mech_id)
-        for param_name, param_value in mech_def.parameters.items():
-            if not isinstance(param_value, Constraint):
-                mech.set_parameter(param_name, param_value)
-        mechs[mech_id] = mech
 
-    return mechs
+def _concrete_mech_values(
+    mech_defs: dict["MechId", "Mechanism"]
+) -> dict["MechIdTuple", dict[str, float]]:
+    return {
+        (mech_id,) if isinstance(mech_id, str) else mech_id: {
+            name: value
+            for name, value in mech_def.parameters.items()
+            if not isinstance(value, Constraint)
+        }
+        for mech_id, mech_def in mech_defs.items()
+    }
 
 
 class LocationAccessor:
@@ -242,7 +330,8 @@ class LocationAccessor:
         self._loc = loc
         self._section = section
         self._mechs = mechdict(mechs)
-        self._arcs = arcs
+        self._a0 = arcs[0]
+        self._da = arcs[1] - arcs[0]
 
     def set_parameter(self, *args, **kwargs):
         """
@@ -261,5 +350,4 @@ class LocationAccessor:
         return self._mechs
 
     def arc(self, x=0):
-        a0, a1 = self._arcs
-        return (a1 - a0) * x + a0
+        return self._da * x + self._a0
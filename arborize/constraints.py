@@ -1,8 +1,12 @@
 import dataclasses
-import itertools
 import typing
+from types import MappingProxyType
+from typing import Mapping
 
-from ._util import MechId
+import numpy as np
+import numpy.typing as npt
+
+from ._util import MechId, field_names
 from .definitions import (
     CableProperties,
     CableType,
@@ -15,10 +19,15 @@ from .definitions import (
 
 
 class Constraint:
-    def __init__(self):
-        self._upper = None
-        self._lower = None
+    __slots__ = ("_upper", "_lower", "_tolerance", "_lower_adj", "_upper_adj")
+
+    def __init__(self, lower: float = None, upper: float = None):
+        self._upper = upper
+        self._lower = lower
         self._tolerance = None
+        # Tolerance adjusted bounds, updated whenever a bound or the tolerance changes.
+        self._lower_adj = lower
+        self._upper_adj = upper
 
     @property
     def tolerance(self):
@@ -26,42 +35,45 @@ class Constraint:
 
     @property
     def lower(self):
-        value = self._lower
-        if self.tolerance is not None:
-            value *= 1 - self.tolerance
-        return value
+        return self._lower_adj
 
     @lower.setter
     def lower(self, value: float):
         self._lower = value
+        self._adjust()
 
     @property
     def upper(self):
-        value = self._upper
-        if self.tolerance is not None:
-            value *= 1 - self.tolerance
-        return value
+        return self._upper_adj
 
     @upper.setter
     def upper(self, value: float):
         self._upper = value
+        self._adjust()
+
+    def _adjust(self):
+        lower, upper, tolerance = self._lower, self._upper, self._tolerance
+        if tolerance is not None:
+            # The tolerance widens the bounds by a fraction of their magnitude, so that
+            # negative bounds widen too.
+            if lower is not None:
+                lower -= abs(lower) * tolerance
+            if upper is not None:
+                upper += abs(upper) * tolerance
+        self._lower_adj, self._upper_adj = lower, upper
 
     @classmethod
     def from_value(cls, value: "ConstraintValue") -> "Constraint":
         if isinstance(value, Constraint):
             return value
         elif isinstance(value, (list, tuple)):
-            constraint = cls()
-            constraint.lower = value[0]
-            constraint.upper = value[1]
+            return cls(value[0], value[1])
         else:
-            constraint = cls()
-            constraint.upper = value
-            constraint.lower = value
-        return constraint
+            return cls(value, value)
 
     def set_tolerance(self, tolerance=None):
         self._tolerance = tolerance
+        self._adjust()
         return self
 
 
@@ -80,8 +92,8 @@ class CablePropertyConstraints(CableProperties):
     """
 
     def __post_init__(self):
-        for field in dataclasses.fields(self):
-            _convert_field(self, field)
+        for name in field_names(type(self)):
+            _convert_field(self.__dict__, name)
 
 
 CablePropertyConstraintsDict = typing.TypedDict(
@@ -98,8 +110,8 @@ class IonConstraints(Ion):
     ext_con: Constraint
 
     def __post_init__(self):
-        for field in dataclasses.fields(self):
-            _convert_field(self, field)
+        for name in field_names(type(self)):
+            _convert_field(self.__dict__, name)
 
 
 IonConstraintsDict = typing.TypedDict(
@@ -143,12 +155,8 @@ class CableTypeConstraints(CableType):
     @classmethod
     def default(cls, ion_class=IonConstraints):
         default = super().default(ion_class=ion_class)
-        for field in dataclasses.fields(default.cable):
-            setattr(
-                default.cable,
-                field.name,
-                Constraint.from_value(getattr(default.cable, field.name)),
-            )
+        for name in field_names(type(default.cable)):
+            _convert_field(default.cable.__dict__, name)
         return default
 
 
@@ -173,30 +181,11 @@ class ConstraintsDefinition(
         SynapseConstraints,
     ]
 ):
-    @classmethod
-    @property
-    def cable_type_class(cls):
-        return CableTypeConstraints
-
-    @classmethod
-    @property
-    def cable_properties_class(cls):
-        return CablePropertyConstraints
-
-    @classmethod
-    @property
-    def ion_class(cls):
-        return IonConstraints
-
-    @classmethod
-    @property
-    def mechanism_class(cls):
-        return MechanismConstraints
-
-    @classmethod
-    @property
-    def synapse_class(cls):
-        return SynapseConstraints
+    cable_type_class = CableTypeConstraints
+    cable_properties_class = CablePropertyConstraints
+    ion_class = IonConstraints
+    mechanism_class = MechanismConstraints
+    synapse_class = SynapseConstraints
 
     def set_tolerance(self, tolerance=None):
         for syn in self._synapse_types.values():
@@ -204,19 +193,64 @@ class ConstraintsDefinition(
                 p.set_tolerance(tolerance)
 
         for ct in self._cable_types.values():
-            for field in dataclasses.fields(ct.cable):
-                getattr(ct.cable, field.name).set_tolerance(tolerance)
+            for name in field_names(type(ct.cable)):
+                getattr(ct.cable, name).set_tolerance(tolerance)
             for ion in ct.ions.values():
-                for field in dataclasses.fields(ion):
-                    getattr(ion, field.name).set_tolerance(tolerance)
-            for mech in itertools.chain(ct.mechs.values(), ct.synapses.values()):
+                for name in field_names(type(ion)):
+                    getattr(ion, name).set_tolerance(tolerance)
+            for mech in ct.mechs.values():
                 for p in mech.parameters.values():
                     p.set_tolerance(tolerance)
+            for syn in ct.synapses.values():
+                for p in syn.parameters.values():
+                    p.set_tolerance(tolerance)
 
-
-def _convert_field(obj, field):
-    constraint = Constraint.from_value(getattr(obj, field.name))
-    setattr(obj, field.name, constraint)
+    def compile(
+        self,
+    ) -> tuple[Mapping[tuple, int], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Collect the tolerance adjusted bounds of all constraints into arrays.
+
+        :returns: A read-only map of each constraint's key to its index in the arrays,
+          and the read-only arrays of the lower and upper bounds. The keys follow the
+          structure of the definition dictionary, e.g. ``("cable_types", "soma", "cable", "Ra")`` or
+          ``("synapse_types", "AMPA", "tau")``.
+        """
+        index = {}
+        bounds = []
+        for key, constraint in self._iter_constraints():
+            index[key] = len(bounds)
+            bounds.append((constraint.lower, constraint.upper))
+        # Missing bounds (`None`) become NaN.
+        bounds = np.array(bounds, dtype=np.float64).reshape(-1, 2)
+        lower, upper = bounds[:, 0].copy(), bounds[:, 1].copy()
+        # The arrays are a snapshot, make them read-only so they can be shared safely.
+        lower.flags.writeable = upper.flags.writeable = False
+        return MappingProxyType(index), lower, upper
+
+    def _iter_constraints(self):
+        for label, syn in self._synapse_types.items():
+            for param, c in syn.parameters.items():
+                yield ("synapse_types", label, param), c
+        for label, ct in self._cable_types.items():
+            key = ("cable_types", label)
+            for name in field_names(type(ct.cable)):
+                yield (*key, "cable", name), getattr(ct.cable, name)
+            for ion_name, ion in ct.ions.items():
+                for name in field_names(type(ion)):
+                    yield (*key, "ions", ion_name, name), getattr(ion, name)
+            for mech_id, mech in ct.mechs.items():
+                for param, c in mech.parameters.items():
+                    yield (*key, "mechanisms", mech_id, param), c
+            for syn_label, syn in ct.synapses.items():
+                for param, c in syn.parameters.items():
+                    yield (*key, "synapses", syn_label, param), c
+
+
+def _convert_field(obj_dict, name):
+    # The constraint dataclasses have no slots or field descriptors, so their
+    # instance dict can be updated directly.
+    obj_dict[name] = Constraint.from_value(obj_dict[name])
 
 
 ConstraintsDefinitionDict = typing.TypedDict(
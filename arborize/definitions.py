@@ -1,7 +1,6 @@
 import abc
 import dataclasses
 import typing
-from abc import abstractmethod
 
 from ._util import Assert, Copy, Iterable, MechId, MechIdTuple, Merge
 from .exceptions import ModelDefinitionError
@@ -246,35 +245,12 @@ S = typing.TypeVar("S", bound=Synapse)
 
 
 class Definition(typing.Generic[CT, CP, I, M, S], abc.ABC):
-    @classmethod
-    @property
-    @abstractmethod
-    def cable_type_class(cls) -> typing.Type[CT]:
-        pass
-
-    @classmethod
-    @property
-    @abstractmethod
-    def cable_properties_class(cls) -> typing.Type[CP]:
-        pass
-
-    @classmethod
-    @property
-    @abstractmethod
-    def ion_class(cls) -> typing.Type[I]:
-        pass
-
-    @classmethod
-    @property
-    @abstractmethod
-    def mechanism_class(cls) -> typing.Type[M]:
-        pass
-
-    @classmethod
-    @property
-    @abstractmethod
-    def synapse_class(cls) -> typing.Type[S]:
-        pass
+    # Subclasses set the classes that make up their definitions.
+    cable_type_class: typing.Type[CT]
+    cable_properties_class: typing.Type[CP]
+    ion_class: typing.Type[I]
+    mechanism_class: typing.Type[M]
+    synapse_class: typing.Type[S]
 
     def __init__(self, use_defaults=False):
         self._cable_types: dict[str, CT] = {}
@@ -310,30 +286,11 @@ class Definition(typing.Generic[CT, CP, I, M, S], abc.ABC):
 
 
 class ModelDefinition(Definition[CableType, CableProperties, Ion, Mechanism, Synapse]):
-    @classmethod
-    @property
-    def cable_type_class(cls):
-        return CableType
-
-    @classmethod
-    @property
-    def cable_properties_class(cls):
-        return CableProperties
-
-    @classmethod
-    @property
-    def ion_class(cls):
-        return Ion
-
-    @classmethod
-    @property
-    def mechanism_class(cls):
-        return Mechanism
-
-    @classmethod
-    @property
-    def synapse_class(cls):
-        return Synapse
+    cable_type_class = CableType
+    cable_properties_class = CableProperties
+    ion_class = Ion
+    mechanism_class = Mechanism
+    synapse_class = Synapse
 
 
 ModelDefinitionDict = typing.TypedDict(
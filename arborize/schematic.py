@@ -1,14 +1,16 @@
+import itertools
 import typing
-from collections import deque
 from typing import Iterable, Optional, Union
 
 import errr
+import numpy as np
 
 from ._util import get_location_name
 from .definitions import CableType, ModelDefinition
 from .exceptions import ConstructionError, FrozenError, ModelDefinitionError
 
 if typing.TYPE_CHECKING:
+    import numpy.typing as npt
     from builders._arbor import CableCellTemplate
 
     from .parameter import Parameter
@@ -21,6 +23,15 @@ def throw_frozen():
     raise FrozenError("Can't alter finished schematic.")
 
 
+def _check_precision(precision):
+    dtype = np.dtype(precision)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(
+            f"Schematic precision must be 'float32' or 'float64', not '{precision}'."
+        )
+    return dtype
+
+
 def _random_name():
     import random
     import string
@@ -46,8 +57,9 @@ class Schematic:
 
     arbor: typing.Optional["CableCellTemplate"]
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, precision="float64"):
         self._name = name
+        self._precision = _check_precision(precision)
         self._frozen = False
         self._definition: ModelDefinition = ModelDefinition()
         self.cables: list["CableBranch"] = []
@@ -58,15 +70,13 @@ class Schematic:
         """
         Iterate over the unit branches depth-first order.
         """
-        stack: deque["UnitBranch"] = deque(self.roots)
-        while True:
-            try:
-                branch = stack.pop()
-            except IndexError:
-                break
+        stack: list["UnitBranch"] = [*self.roots]
+        pop, extend = stack.pop, stack.extend
+        while stack:
+            branch = pop()
             yield branch
             if branch.children:
-                stack.extend(reversed(branch.children))
+                extend(branch.children[::-1])
 
     def __len__(self):
         return len([*iter(self)])
@@ -86,6 +96,22 @@ class Schematic:
         else:
             self._name = value
 
+    @property
+    def precision(self):
+        """
+        Floating point type of the point buffers created when the schematic is frozen.
+        Use ``"float32"`` to halve their memory and bandwidth, at the cost of precision.
+        Only ``"float32"`` and ``"float64"`` are accepted.
+        """
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        if self._frozen:
+            raise FrozenError("Can't change precision of finished schematic.")
+        else:
+            self._precision = _check_precision(value)
+
     @property
     def definition(self):
         """
@@ -101,6 +127,29 @@ class Schematic:
         else:
             self._definition = value
 
+    @property
+    def branches(self) -> tuple["UnitBranch", ...]:
+        """
+        The unit branches in depth-first order, once the schematic is frozen. Parents
+        precede their children.
+        """
+        if not self._frozen:
+            raise FrozenError(
+                "Schematic must be finished before ordering its branches."
+            )
+        return self._branches
+
+    @property
+    def parent_positions(self) -> tuple[int, ...]:
+        """
+        Position of the parent of each branch in ``branches``, or -1 for the roots.
+        """
+        if not self._frozen:
+            raise FrozenError(
+                "Schematic must be finished before ordering its branches."
+            )
+        return self._parent_positions
+
     def create_name(self):
         """
         Generate the next unique name for an instance of this model.
@@ -187,9 +236,17 @@ class Schematic:
             )
 
     def freeze(self):
-        """Freeze the schematic. Most mutating operations will no longer be permitted."""
+        """
+        Freeze the schematic. Most mutating operations will no longer be permitted.
+
+        Freezing merges the definition of each unit branch from its labels. Branches
+        with the same labels share a single definition object, and builders cache
+        values derived from it, so the definitions must not be changed afterwards.
+        """
         if not self._frozen:
             self._flatten_branches(self.roots)
+            self._make_point_buffers()
+            self._make_branch_order()
             self._name = self._name if self._name is not None else _random_name()
             self._frozen = True
             # If we are a constraint schematic, reconvert after freezing.
@@ -198,15 +255,24 @@ class Schematic:
                 # fixme: ion defaults are not constraints
                 from .constraints import Constraint
 
-                for branch in self:
-                    for ion in branch.definition.ions.values():
+                # Branches can share definitions, convert each definition once.
+                for definition in dict.fromkeys(branch.definition for branch in self):
+                    for ion in definition.ions.values():
                         for prop, value in ion:
                             setattr(ion, prop, Constraint.from_value(value))
 
-    def _flatten_branches(self, branches: Iterable["UnitBranch"]):
+    def _flatten_branches(
+        self, branches: Iterable["UnitBranch"], sort_labels=None, makedef=None
+    ):
+        if sort_labels is None:
+            sort_labels = self._make_label_sorter()
+        if makedef is None:
+            makedef = self._make_definition_cache()
         for branch in branches:
+            # Sort the labels once, both the definition and the compound name need them.
+            branch.sorted_labels = sort_labels(branch.labels)
             # Concretize the true branch definition by merging all labels and params.
-            branch.definition = self._makedef(branch.labels)
+            branch.definition = makedef(branch.sorted_labels)
             try:
                 # Assert that none of the values are missing (= `None`)
                 branch.definition.assert_()
@@ -220,16 +286,55 @@ class Schematic:
                     f"{locstr} labelled {errr.quotejoin(branch.labels)} "
                     f"misses value for {e.args[1:]}"
                 ) from None
-            self._flatten_branches(branch.children)
+            self._flatten_branches(branch.children, sort_labels, makedef)
+
+    def _make_point_buffers(self):
+        # Store the coordinates and radii of all points in contiguous arrays, and give
+        # each cable and unit branch a slice into them.
+        npts = sum(len(cable.points) for cable in self.cables)
+        self._coords = np.empty((npts, 3), dtype=self._precision)
+        self._radii = np.empty(npts, dtype=self._precision)
+        offset = 0
+        for cable in self.cables:
+            end = offset + len(cable.points)
+            cable.point_slice = slice(offset, end)
+            if cable.points:
+                # Fill each cable's block at once, instead of point by point.
+                self._coords[offset:end] = [point.coords for point in cable.points]
+                self._radii[offset:end] = [point.radius for point in cable.points]
+            offset = end
+        # The points of a unit branch are consecutive points of a cable.
+        for cable in self.cables:
+            offset = cable.point_slice.start
+            for unit, points in itertools.groupby(cable.points, lambda pt: pt.branch):
+                end = offset + len([*points])
+                unit.point_slice = slice(offset, end)
+                offset = end
+        for branch in itertools.chain(self.cables, self):
+            branch.coords = self._coords[branch.point_slice]
+            branch.radii = self._radii[branch.point_slice]
+
+    def _make_branch_order(self):
+        # Store the unit branches in depth-first order, and the position of each
+        # branch's parent in that order (-1 for roots), so builders can connect the
+        # branches by position.
+        self._branches: tuple["UnitBranch", ...] = (*self,)
+        index = {branch: i for i, branch in enumerate(self._branches)}
+        self._parent_positions: tuple[int, ...] = tuple(
+            index[branch.parent] if branch.parent else -1 for branch in self._branches
+        )
 
-    def _makedef(self, labels: typing.Sequence[str]) -> CableType:
-        # Determine the cable type priority order based on the key order in the dict.
-        sort_labels = self._make_label_sorter()
-        return self.definition.cable_type_class.anchor(
-            (self._definition._cable_types.get(label) for label in sort_labels(labels)),
-            synapses=self._definition.get_synapse_types(),
-            use_defaults=self.definition.use_defaults,
-            ion_class=self._definition.ion_class,
+    def _makedef(self, sorted_labels: typing.Sequence[str]) -> CableType:
+        # The labels must be sorted in cable type priority order, see
+        # `_make_label_sorter`.
+        definition = self._definition
+        # `anchor` merges copies of the cable types into a new cable type, so the
+        # definition doesn't have to be copied first, like `self.definition` does.
+        return definition.cable_type_class.anchor(
+            (definition._cable_types.get(label) for label in sorted_labels),
+            synapses=definition.get_synapse_types(),
+            use_defaults=definition.use_defaults,
+            ion_class=definition.ion_class,
         )
 
     def get_cable_types(self):
@@ -242,27 +347,38 @@ class Schematic:
         if not self._frozen:
             raise RuntimeError("Can only compound cable types in frozen schematic.")
 
-        name_labels = self._make_label_namer()
-        return {name_labels(branch.labels): branch.definition for branch in self}
+        return {
+            _name_sorted_labels(branch.sorted_labels): branch.definition
+            for branch in self
+        }
+
+    def _make_definition_cache(self):
+        # Branches with the same labels get the same definition, so each label
+        # combination is merged once and its definition shared by those branches.
+        definitions: dict[tuple[str, ...], CableType] = {}
+
+        def makedef(sorted_labels):
+            key = tuple(sorted_labels)
+            try:
+                return definitions[key]
+            except KeyError:
+                definition = definitions[key] = self._makedef(sorted_labels)
+                return definition
+
+        return makedef
 
     def _make_label_sorter(self):
-        insert_index = [*self._definition._cable_types.keys()].index
-        len_ = len(self._definition._cable_types)
+        # Determine the cable type priority order based on the key order in the dict.
+        insert_index = {lbl: i for i, lbl in enumerate(self._definition._cable_types)}
 
         def label_order(lbl):
-            try:
-                insert = insert_index(lbl)
-            except ValueError:
-                insert = -1
-            return (insert, lbl)
+            return (insert_index.get(lbl, -1), lbl)
 
         return lambda labels: sorted(labels, key=label_order)
 
-    def _make_label_namer(self):
-        sort_labels = self._make_label_sorter()
-        return lambda labels: "_".join(
-            l.replace("_", "__") for l in sort_labels(labels)
-        )
+
+def _name_sorted_labels(labels: typing.Sequence[str]) -> str:
+    return "_".join(l.replace("_", "__") for l in labels)
 
 
 class Point:
@@ -277,6 +393,18 @@ class Branch:
     points: list[Point]
     parent: Optional["Branch"]
     children: list["Branch"]
+    point_slice: slice
+    """
+    Slice of this branch's points in the point buffers of the frozen schematic.
+    """
+    coords: "npt.NDArray[np.floating]"
+    """
+    View of the coordinates of this branch's points, once the schematic is frozen.
+    """
+    radii: "npt.NDArray[np.floating]"
+    """
+    View of the radii of this branch's points, once the schematic is frozen.
+    """
 
     def __init__(self):
         self.points = []
@@ -312,7 +440,12 @@ class UnitBranch(Branch):
     parent: Optional["UnitBranch"]
     children: list["UnitBranch"]
     labels: list[str]
+    sorted_labels: list[str]
     definition: CableType
+    """
+    Merged definition of this branch's labels, once the schematic is frozen. It is
+    shared by all branches with the same labels, and must not be changed.
+    """
 
     def append(self, point):
         self.points.append(point)
@@ -4,7 +4,7 @@ from itertools import zip_longest
 import arbor
 
 from arborize import Schematic, arbor_build
-from arborize.builders._arbor import get_decor, get_label_dict, hash_labelset
+from arborize.builders._arbor import get_decor, get_label_dict
 
 from ._shared import SchematicsFixture
 
@@ -24,17 +24,15 @@ class TestModelBuilding(SchematicsFixture, unittest.TestCase):
         assert (
             len(self.schematic.cables) == self.schematic.arbor.morphology.num_branches
         )
-        keys = [*branch_endpoints.keys()]
+        pindex = {b: i for i, b in enumerate(branch_endpoints)}
 
-        def pid(i):
-            try:
-                return keys.index(i)
-            except ValueError:
-                # Value for no parent in Arbor
-                return arbor.mnpos
+        def pid(b):
+            # Default to the value for no parent in Arbor
+            return pindex.get(b, arbor.mnpos)
 
         n_branches = 0
         n_points = 0
+        pwlin = arbor.place_pwlin(self.schematic.arbor.morphology)
         # Assert that the data was transferred correctly.
         for bid, vb in enumerate(self.schematic.cables):
             n_branches += 1
@@ -44,7 +42,6 @@ class TestModelBuilding(SchematicsFixture, unittest.TestCase):
                 "Parent error",
             )
             segments = self.schematic.arbor.morphology.branch_segments(bid)
-            pwlin = arbor.place_pwlin(self.schematic.arbor.morphology)
             self.assertEqual(
                 len(vb.points) - 1, len(segments), "Incorrect amount of points"
             )
@@ -125,9 +122,9 @@ class TestModelLabelDict(unittest.TestCase):
         schematic.create_location((0, 0), [0, 0, 0], 1, ["soma"])
         schematic.create_location((0, 1), [0, 0, 1], 1, ["soma", "nonsoma"])
         labelsets, label_dict = get_label_dict(schematic)
-        self.assertEqual(0, labelsets.get(hash_labelset(["soma"])))
-        self.assertEqual(1, labelsets.get(hash_labelset(["nonsoma", "soma"])))
-        self.assertEqual(1, labelsets.get(hash_labelset(["nonsoma", "soma"])))
+        self.assertEqual(0, labelsets.get(frozenset(["soma"])))
+        self.assertEqual(1, labelsets.get(frozenset(["nonsoma", "soma"])))
+        self.assertEqual(1, labelsets.get(frozenset(["soma", "nonsoma"])))
 
 
 def _mkpt(p: "Point") -> arbor.mpoint:
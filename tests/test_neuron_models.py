@@ -37,6 +37,11 @@ class TestModelBuilding(SchematicsFixture, unittest.TestCase):
             "pas inserted in some apical sections",
         )
 
+    def test_nseg(self):
+        cell = neuron_build(self.p75_pas)
+        for sec in cell.sections:
+            self.assertEqual(int(sec.L // 10) + 1, sec.nseg, "nseg not based on L")
+
     def test_synapses(self):
         cell = neuron_build(self.p75_expsyn)
         cell_nosyn = neuron_build(self.p75_expsyn)
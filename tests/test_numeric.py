@@ -0,0 +1,38 @@
+import unittest
+
+import numpy as np
+
+from arborize._numeric import (
+    _cumulative_lengths,
+    _cumulative_lengths_loop,
+    cumulative_lengths,
+)
+from arborize._util import get_arclengths
+
+
+class TestArclengths(unittest.TestCase):
+    def setUp(self):
+        self.coords = np.random.default_rng(0).random((20, 3)) * 100
+
+    def test_cumulative_lengths(self):
+        expected = np.concatenate(
+            ([0], np.cumsum(np.linalg.norm(np.diff(self.coords, axis=0), axis=1)))
+        )
+        for kernel in (_cumulative_lengths, _cumulative_lengths_loop):
+            with self.subTest(kernel=kernel.__name__):
+                np.testing.assert_allclose(kernel(self.coords), expected)
+        np.testing.assert_allclose(cumulative_lengths(self.coords), expected)
+
+    def test_get_arclengths(self):
+        arcs = get_arclengths(self.coords)
+        expected = _cumulative_lengths(self.coords)
+        np.testing.assert_allclose(arcs, expected / expected[-1])
+        self.assertEqual(0, arcs[0])
+        self.assertEqual(1, arcs[-1])
+        arcs32 = get_arclengths(self.coords.astype(np.float32))
+        np.testing.assert_allclose(arcs32, arcs, rtol=1e-5)
+
+    def test_get_arclengths_degenerate(self):
+        np.testing.assert_array_equal(np.ones(0), get_arclengths(np.empty((0, 3))))
+        np.testing.assert_array_equal(np.ones(1), get_arclengths([[1, 2, 3]]))
+        np.testing.assert_array_equal(np.ones(3), get_arclengths([[1, 2, 3]] * 3))
@@ -2,6 +2,7 @@ import pathlib
 import unittest
 
 from arborize import bluepyopt_build, define_constraints, file_schematic
+from arborize.constraints import Constraint
 
 
 class TestBluePyOptimization(unittest.TestCase):
@@ -103,3 +104,51 @@ class TestBluePyOptimization(unittest.TestCase):
         self.assertAlmostEqual(0.12, best_ind_dict["gnabar_hh_soma"], 2)
         self.assertAlmostEqual(0.011, best_ind_dict["gkbar_hh_soma"], 3)
         self.assertGreater(outcome["step2.Spikecount"], outcome["step1.Spikecount"])
+
+
+class TestConstraints(unittest.TestCase):
+    def test_tolerance(self):
+        constraint = Constraint.from_value([2.0, 4.0])
+        self.assertEqual((2.0, 4.0), (constraint.lower, constraint.upper))
+        constraint.set_tolerance(0.5)
+        self.assertEqual((1.0, 6.0), (constraint.lower, constraint.upper))
+        constraint.upper = 8.0
+        self.assertEqual(12.0, constraint.upper, "bound change ignored tolerance")
+        constraint.set_tolerance(None)
+        self.assertEqual((2.0, 8.0), (constraint.lower, constraint.upper))
+        # Negative bounds widen by their magnitude too.
+        constraint = Constraint.from_value(-70.0).set_tolerance(0.5)
+        self.assertEqual((-105.0, -35.0), (constraint.lower, constraint.upper))
+        constraint = Constraint.from_value([-80.0, -60.0]).set_tolerance(0.5)
+        self.assertEqual((-120.0, -30.0), (constraint.lower, constraint.upper))
+        constraint = Constraint.from_value([-2.0, 4.0]).set_tolerance(0.5)
+        self.assertEqual((-3.0, 6.0), (constraint.lower, constraint.upper))
+
+    def test_compile(self):
+        constraints = define_constraints(
+            {
+                "cable_types": {
+                    "soma": {
+                        "cable": {"Ra": 100.0, "cm": [1.0, 2.0]},
+                        "mechanisms": {
+                            "hh": {"gnabar": [0.05, 0.125]},
+                            "pas": {"e": [-80.0, -60.0]},
+                        },
+                    },
+                },
+                "synapse_types": {"AMPA": {"tau": 2.0}},
+            },
+            tolerance=0.5,
+        )
+        index, lower, upper = constraints.compile()
+        self.assertEqual(5, len(index))
+        i = index[("cable_types", "soma", "cable", "cm")]
+        self.assertEqual((0.5, 3.0), (lower[i], upper[i]))
+        i = index[("cable_types", "soma", "mechanisms", "hh", "gnabar")]
+        self.assertEqual((0.025, 0.1875), (lower[i], upper[i]))
+        i = index[("cable_types", "soma", "mechanisms", "pas", "e")]
+        self.assertEqual((-120.0, -30.0), (lower[i], upper[i]))
+        i = index[("synapse_types", "AMPA", "tau")]
+        self.assertEqual((1.0, 3.0), (lower[i], upper[i]))
+        with self.assertRaises(ValueError):
+            lower[0] = 0
@@ -3,6 +3,8 @@ import unittest
 import numpy as np
 
 from arborize import define_model
+from arborize.exceptions import FrozenError
+from arborize.schematic import Schematic
 from arborize.schematics import file_schematic
 from tests._shared import SchematicsFixture
 
@@ -27,6 +29,22 @@ class TestFileSchematic(SchematicsFixture, unittest.TestCase):
         # MorphIO to load SWC files that have multiple different tags on a branch
         pass
 
+    def test_precision(self):
+        self.one_branch.definition = define_model({}, use_defaults=True)
+        self.one_branch.precision = "float32"
+        self.one_branch.freeze()
+        for cable in self.one_branch.cables:
+            self.assertEqual(np.float32, cable.coords.dtype)
+            self.assertEqual(np.float32, cable.radii.dtype)
+        with self.assertRaises(FrozenError):
+            self.one_branch.precision = "float64"
+
+    def test_precision_not_float(self):
+        with self.assertRaises(ValueError):
+            self.one_branch.precision = "int32"
+        with self.assertRaises(ValueError):
+            Schematic(precision="int32")
+
     def test_one_branch(self):
         # Expect soma + one branch
         self.assertEqual(2, len(self.one_branch.cables), "expected 2 branches")
@@ -70,3 +88,40 @@ class TestFileSchematic(SchematicsFixture, unittest.TestCase):
             np.array_equal([0.0, 6.0, 0.0], self.two_branch.cables[1].points[0].coords),
             "incorrect coords",
         )
+
+    def test_shared_definitions(self):
+        self.p75_pas.freeze()
+        branches = [*self.p75_pas]
+        for a, b in zip(branches, branches[1:]):
+            if a.labels == b.labels:
+                self.assertIs(a.definition, b.definition)
+            else:
+                self.assertIsNot(a.definition, b.definition)
+
+    def test_branch_order(self):
+        with self.assertRaises(FrozenError):
+            self.p75_pas.branches
+        with self.assertRaises(FrozenError):
+            self.p75_pas.parent_positions
+        self.p75_pas.freeze()
+        branches = self.p75_pas.branches
+        parents = self.p75_pas.parent_positions
+        self.assertEqual(len(branches), len(parents))
+        for i, (branch, parent) in enumerate(zip(branches, parents)):
+            if branch.parent is None:
+                self.assertEqual(-1, parent)
+            else:
+                self.assertLess(parent, i)
+                self.assertIs(branch.parent, branches[parent])
+
+    def test_point_views(self):
+        self.p75_pas.freeze()
+        for branch in (*self.p75_pas.cables, *self.p75_pas):
+            self.assertTrue(
+                np.array_equal([pt.coords for pt in branch.points], branch.coords),
+                "incorrect coords",
+            )
+            self.assertTrue(
+                np.array_equal([pt.radius for pt in branch.points], branch.radii),
+                "incorrect radii",
+            )